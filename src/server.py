@@ -2,180 +2,442 @@ import os
 import multiprocessing
 import uvicorn
 from mcp.server.fastmcp import FastMCP
-import yaml, requests, uuid
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.types import Tool as MCPTool, TextContent
+import requests
+import httpx
+import orjson
+import jsonref
 import logging
-import traceback
-import sys
+import string
+import time
+import contextlib
+import functools
 
 # Configure logging
+# (defaults to WARNING in production to keep per-request logging off the hot path; override with LOG_LEVEL)
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "WARNING" if os.getenv("RUNNING_IN_PRODUCTION") else "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger("docker-mcp")
 logger.info("Starting dockerized MCP server initialization")
 
-try:
-    logger.info("Initializing FastMCP instance")
-    mcp = FastMCP("docker-mcp")
-    app = mcp.sse_app()
-    logger.info("FastMCP instance and SSE app successfully created")
-except Exception as e:
-    logger.error(f"Failed to initialize FastMCP: {str(e)}")
-    logger.error(traceback.format_exc())
-    sys.exit(1)
+# tool name -> (path, method, operation); each tool's closure is only built on its first call
+_operations = {}
+
+
+class OpenAPIFastMCP(FastMCP):
+    """FastMCP that publishes OpenAPI operations as tools without materializing them up front."""
+
+    async def list_tools(self):
+        return await super().list_tools() + _list_operation_tools()
+
+    async def call_tool(self, name, arguments):
+        if name not in _operations:
+            return await super().call_tool(name, arguments)
+        # mirror ToolManager/Tool.run error wrapping and FastMCP's result conversion
+        try:
+            result = await _get_tool(name)(**arguments)
+        except Exception as e:
+            raise ToolError(f"Error executing tool {name}: {e}") from e
+        if result is None:
+            return []
+        if not isinstance(result, str):
+            result = orjson.dumps(result).decode()
+        return [TextContent(type="text", text=result)]
+
+
+logger.info("Initializing FastMCP instance")
+mcp = OpenAPIFastMCP("docker-mcp")
+app = mcp.sse_app()
+logger.info("FastMCP instance and SSE app successfully created")
 
 TOOL_PREFIX = os.getenv("TOOL_PREFIX", "tool")
 logger.info(f"Using tool prefix: {TOOL_PREFIX}")
 
+# read once; the environment does not change over the life of the process
+_API_TOKEN = os.getenv('SALABLE_API_TOKEN')
+if not _API_TOKEN:
+    logger.warning("SALABLE_API_TOKEN environment variable is not set")
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'patch', 'head', 'options', 'trace')
+
+def _resolve_local_refs(node, root, drop_unresolved=False, seen=()):
+    # inline local "#/..." $refs against root; refs that would recurse (or don't resolve) are kept,
+    # or stripped down to their sibling keys with drop_unresolved (for schemas published without components)
+    if isinstance(node, list):
+        return [_resolve_local_refs(v, root, drop_unresolved, seen) for v in node]
+    if not isinstance(node, dict):
+        return node
+    siblings = {k: _resolve_local_refs(v, root, drop_unresolved, seen) for k, v in node.items() if k != '$ref'}
+    ref = node.get('$ref')
+    if not isinstance(ref, str):
+        return siblings
+    target = None
+    if ref.startswith('#/') and ref not in seen:
+        target = root
+        try:
+            for part in ref[2:].split('/'):
+                part = part.replace('~1', '/').replace('~0', '~')
+                target = target[int(part)] if isinstance(target, list) else target[part]
+        except (KeyError, IndexError, TypeError, ValueError):
+            target = None
+    if target is None:
+        return siblings if drop_unresolved else {'$ref': ref, **siblings}
+    resolved = _resolve_local_refs(target, root, drop_unresolved, seen + (ref,))
+    # keys next to the $ref win, like jsonref's merge_props
+    return {**resolved, **siblings} if isinstance(resolved, dict) else resolved
+
 # Determine where to load/save the OpenAPI spec
+# a downloaded spec younger than this many seconds is reused without contacting the server
+SPEC_REFRESH_INTERVAL = int(os.getenv("OPENAPI_SPEC_REFRESH_INTERVAL", "60"))
 download_url = os.getenv("OPENAPI_SPEC_URL")
 local_spec = os.path.join(os.path.dirname(__file__), "openapi.v2.yaml")
 logger.info(f"Download URL: {download_url}, Local spec path: {local_spec}")
 
-try:
-    if download_url:
-        # write into a writable temp location
-        spec_path = os.path.join("/tmp", "openapi.v2.yaml")
-        logger.info(f"Creating directory for downloaded spec at {os.path.dirname(spec_path)}")
-        os.makedirs(os.path.dirname(spec_path), exist_ok=True)
-        logger.info(f"Downloading OpenAPI spec from {download_url}")
-        try:
-            resp = requests.get(download_url)
-            logger.info(f"Download response status: {resp.status_code}")
-            resp.raise_for_status()
-            with open(spec_path, "wb") as f:
-                f.write(resp.content)
-            logger.info(f"OpenAPI spec successfully downloaded to {spec_path}, size: {len(resp.content)} bytes")
-        except requests.RequestException as e:
-            logger.error(f"Failed to download OpenAPI spec: {str(e)}")
-            logger.error(traceback.format_exc())
-            sys.exit(1)
-    else:
-        # use your checked‑in YAML in src/
-        spec_path = local_spec
-        logger.info(f"Using local OpenAPI spec at {spec_path}")
-        if not os.path.exists(spec_path):
-            logger.error(f"Local OpenAPI spec not found at {spec_path}")
-            sys.exit(1)
+if download_url:
+    # write into a writable temp location
+    spec_path = os.path.join("/tmp", "openapi.v2.yaml")
+    logger.info(f"Creating directory for downloaded spec at {os.path.dirname(spec_path)}")
+    os.makedirs(os.path.dirname(spec_path), exist_ok=True)
+    spec_meta_path = spec_path + ".meta"
+    try:
+        import fcntl
+    except ImportError:
+        # no flock on Windows; only single-process development runs happen there
+        fcntl = None
+    # serialize downloads across workers: the first one fetches, the rest find a fresh copy
+    with open(spec_path + ".lock", "w") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        meta = {}
+        if os.path.exists(spec_path) and os.path.exists(spec_meta_path):
+            try:
+                with open(spec_meta_path, "rb") as f:
+                    meta = orjson.loads(f.read())
+            except (OSError, orjson.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable spec metadata {spec_meta_path}: {str(e)}")
+            if meta.get("url") != download_url:
+                meta = {}
+
+        if meta and time.time() - meta.get("fetched_at", 0) < SPEC_REFRESH_INTERVAL:
+            logger.info(f"Reusing OpenAPI spec downloaded {time.time() - meta['fetched_at']:.0f}s ago at {spec_path}")
+        else:
+            # conditional GET so an unchanged spec costs a 304 and keeps the parsed JSON cache valid
+            headers = {}
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+            logger.info(f"Downloading OpenAPI spec from {download_url}")
+            try:
+                resp = requests.get(download_url, headers=headers)
+                logger.info(f"Download response status: {resp.status_code}")
+                if resp.status_code == 304:
+                    logger.info(f"OpenAPI spec not modified, reusing {spec_path}")
+                else:
+                    resp.raise_for_status()
+                    tmp_spec = f"{spec_path}.{os.getpid()}.tmp"
+                    with open(tmp_spec, "wb") as f:
+                        f.write(resp.content)
+                    os.replace(tmp_spec, spec_path)
+                    logger.info(f"OpenAPI spec successfully downloaded to {spec_path}, size: {len(resp.content)} bytes")
+                    meta = {
+                        "url": download_url,
+                        "etag": resp.headers.get("ETag"),
+                        "last_modified": resp.headers.get("Last-Modified"),
+                    }
+            except requests.RequestException as e:
+                logger.exception("Failed to download OpenAPI spec: %s", e)
+                raise SystemExit(1)
+            meta["fetched_at"] = time.time()
+            with open(spec_meta_path, "wb") as f:
+                f.write(orjson.dumps(meta))
+else:
+    # use your checked‑in YAML in src/
+    spec_path = local_spec
+    logger.info(f"Using local OpenAPI spec at {spec_path}")
+    if not os.path.exists(spec_path):
+        logger.error(f"Local OpenAPI spec not found at {spec_path}")
+        raise SystemExit(1)
+
+# prefer the JSON cache of a previous parse when it is at least as new as the YAML
+# and was written in the current format (bump SPEC_CACHE_FORMAT whenever the cached content changes)
+SPEC_CACHE_FORMAT = 3
+spec_cache = spec_path + ".json"
+spec = None
+if os.path.exists(spec_cache) and os.path.getmtime(spec_cache) >= os.path.getmtime(spec_path):
+    try:
+        with open(spec_cache, "rb") as f:
+            cached = orjson.loads(f.read())
+        if isinstance(cached, dict) and cached.get("format") == SPEC_CACHE_FORMAT:
+            spec = cached["spec"]
+            logger.info(f"Loaded cached OpenAPI spec from {spec_cache}")
+        else:
+            logger.info(f"Ignoring spec cache {spec_cache} written in an older format")
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable spec cache {spec_cache}: {str(e)}")
+        spec = None
+
+if spec is None:
+    # PyYAML is only needed when there is no usable JSON cache (e.g. one baked into the image)
+    import yaml
+    try:
+        from yaml import CSafeLoader as SpecLoader
+    except ImportError:
+        from yaml import SafeLoader as SpecLoader
 
     # now load it
     logger.info(f"Attempting to load OpenAPI spec from {spec_path}")
     try:
         with open(spec_path) as f:
-            spec = yaml.safe_load(f)
-            logger.info(f"Successfully loaded OpenAPI spec with version {spec.get('info', {}).get('version', 'unknown')}")
+            spec = yaml.load(f, Loader=SpecLoader)
     except yaml.YAMLError as e:
-        logger.error(f"Failed to parse YAML: {str(e)}")
-        logger.error(traceback.format_exc())
-        sys.exit(1)
-    except Exception as e:
-        logger.error(f"Failed to load OpenAPI spec: {str(e)}")
-        logger.error(traceback.format_exc())
-        sys.exit(1)
-
-    # Check if servers exists in the spec
-    if not spec.get('servers', []):
-        logger.error("No servers found in OpenAPI spec")
-        sys.exit(1)
-        
-    base_url = spec["servers"][0]["url"]
-    logger.info(f"Using base URL: {base_url}")
-
-    def _create_salable_tool(path, method, operation):
-        logger.info(f"Creating tool for {method.upper()} {path}")
-        name = f"{TOOL_PREFIX}_{method}_{path}".lower().replace('/', '_').replace('{', '').replace('}', '').replace('-', '_')
-        logger.debug(f"Tool name will be: {name}")
-        parameters = operation.get('parameters', [])
-        responses = operation.get('responses', {})
-
-        def _tool(**kwargs):
-            token = os.getenv('SALABLE_API_TOKEN')
-            if not token:
-                logger.warning("SALABLE_API_TOKEN environment variable is not set")
-                
-            request_id = str(uuid.uuid4())
-            headers = {
-                'x-api-key': token,
-                'version': spec['info']['version'],
-                'unique-key': request_id,
-                'Accept': 'application/json'
-            }
-            logger.debug(f"Request headers: {headers}")
-            
-            # build URL and query params
-            try:
-                url = base_url + path.format(**kwargs)
-                logger.info(f"Formatted URL: {url}")
-            except KeyError as e:
-                logger.error(f"Missing path parameter: {str(e)}")
-                logger.error(f"Available kwargs: {kwargs}")
-                raise
-                
-            query = {p['name']: kwargs.get(p['name']) for p in parameters if p.get('in') == 'query'}
-            body = kwargs.get('body', None)
+        logger.exception("Failed to parse YAML: %s", e)
+        raise SystemExit(1)
+    except OSError as e:
+        logger.exception("Failed to load OpenAPI spec: %s", e)
+        raise SystemExit(1)
+
+    # resolve $refs once so tool schemas (and the JSON cache) are plain, self-contained dicts
+    spec_json = None
+    try:
+        resolved = jsonref.replace_refs(spec, proxies=False, lazy_load=False, merge_props=True)
+        spec_json = orjson.dumps({"format": SPEC_CACHE_FORMAT, "spec": resolved}, option=orjson.OPT_NON_STR_KEYS)
+        spec = resolved
+    except (jsonref.JsonRefError, TypeError) as e:
+        # a recursive schema (or a bad ref) anywhere blocks flattening the whole tree; still inline the
+        # operation-level parameters and request bodies, keeping $refs only where they actually recurse
+        logger.warning(f"Resolving only operation parameters and request bodies in the OpenAPI spec: {str(e)}")
+        for path_item in spec.get('paths', {}).values():
+            if not isinstance(path_item, dict):
+                continue
+            if 'parameters' in path_item:
+                path_item['parameters'] = _resolve_local_refs(path_item['parameters'], spec)
+            for method in HTTP_METHODS:
+                operation = path_item.get(method)
+                if isinstance(operation, dict):
+                    for key in ('parameters', 'requestBody'):
+                        if key in operation:
+                            operation[key] = _resolve_local_refs(operation[key], spec)
+
+    # write the cache atomically so concurrently booting workers never read a partial file
+    tmp_cache = f"{spec_cache}.{os.getpid()}.tmp"
+    try:
+        if spec_json is None:
+            spec_json = orjson.dumps({"format": SPEC_CACHE_FORMAT, "spec": spec}, option=orjson.OPT_NON_STR_KEYS)
+        with open(tmp_cache, "wb") as f:
+            f.write(spec_json)
+        os.replace(tmp_cache, spec_cache)
+        logger.info(f"Cached parsed OpenAPI spec at {spec_cache}")
+    except (OSError, TypeError) as e:
+        logger.warning(f"Could not cache parsed OpenAPI spec at {spec_cache}: {str(e)}")
+        if os.path.exists(tmp_cache):
+            os.remove(tmp_cache)
+
+logger.info(f"Successfully loaded OpenAPI spec with version {spec.get('info', {}).get('version', 'unknown')}")
+
+# Check if servers exists in the spec
+if not spec.get('servers', []):
+    logger.error("No servers found in OpenAPI spec")
+    raise SystemExit(1)
+    
+base_url = spec["servers"][0]["url"]
+logger.info(f"Using base URL: {base_url}")
+
+# every tool hits the same host, so share one pooled HTTP/2 client across all (async) tool calls
+client = httpx.AsyncClient(
+    base_url=base_url,
+    http2=True,
+    limits=httpx.Limits(
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "64")),
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "128")),
+        # httpx drops idle connections after 5s by default, forcing re-handshakes between bursts
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+    ),
+    timeout=httpx.Timeout(connect=2.0, read=30.0, write=10.0, pool=5.0)
+)
+
+@contextlib.asynccontextmanager
+async def _close_client(app):
+    yield
+    await client.aclose()
+
+app.router.lifespan_context = _close_client
+
+def _new_request_id():
+    # same shape as str(uuid.uuid4()) (version/variant nibbles set) without building a UUID object
+    h = os.urandom(16).hex()
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
+
+_TOOL_NAME_TABLE = str.maketrans({'/': '_', '{': None, '}': None, '-': '_'})
+
+def _tool_name(path, method):
+    return f"{TOOL_PREFIX}_{method}_{path}".lower().translate(_TOOL_NAME_TABLE)
+
+def _input_schema(name, operation):
+    # JSON schema of the keyword arguments accepted by the tool built for an operation
+    properties = {}
+    required = []
+    for p in operation.get('parameters', []):
+        p = _resolve_local_refs(p, spec)
+        if '$ref' in p:
+            logger.warning(f"Tool {name}: cannot resolve parameter {p['$ref']}, leaving it out of the schema")
+            continue
+        if p.get('in') not in ('path', 'query'):
+            continue
+        properties[p['name']] = _resolve_local_refs(p.get('schema', {'type': 'string'}), spec, drop_unresolved=True)
+        if p.get('description'):
+            properties[p['name']]['description'] = p['description']
+        if p.get('required') or p.get('in') == 'path':
+            required.append(p['name'])
+    request_body = _resolve_local_refs(operation.get('requestBody'), spec)
+    if request_body:
+        json_content = request_body.get('content', {}).get('application/json', {})
+        properties['body'] = _resolve_local_refs(json_content.get('schema', {'type': 'object'}), spec, drop_unresolved=True)
+        if request_body.get('required'):
+            required.append('body')
+    return {'type': 'object', 'properties': properties, 'required': required}
+
+@functools.cache
+def _list_operation_tools():
+    return [
+        MCPTool(name=name, description=operation.get('description', ''), inputSchema=_input_schema(name, operation))
+        for name, (path, method, operation) in _operations.items()
+    ]
+
+@functools.cache
+def _get_tool(name):
+    return _create_salable_tool(name, *_operations[name])
+
+def _create_salable_tool(name, path, method, operation):
+    # resolved once per tool rather than on every call
+    method_upper = method.upper()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Creating tool for %s %s", method_upper, path)
+    parameters = [_resolve_local_refs(p, spec) for p in operation.get('parameters', [])]
+    responses = operation.get('responses', {})
+    path_params = tuple(field for _, field, _, _ in string.Formatter().parse(path) if field)
+    query_param_names = tuple(p['name'] for p in parameters if p.get('in') == 'query')
+    static_headers = {
+        'version': spec['info']['version'],
+        'Accept': 'application/json'
+    }
+    if _API_TOKEN:
+        static_headers['x-api-key'] = _API_TOKEN
+
+    async def _tool(**kwargs):
+        request_id = _new_request_id()
+        headers = {**static_headers, 'unique-key': request_id}
+
+        # build URL and query params
+        try:
+            url = path.format_map(kwargs) if path_params else path
+        except KeyError as e:
+            logger.error("Missing path parameter: %s (expected: %s, available kwargs: %s)", e, path_params, list(kwargs))
+            raise
             
-            logger.info(f"API Call: {method.upper()} {url} (Request ID: {request_id})")
+        query = {n: kwargs[n] for n in query_param_names if kwargs.get(n) is not None}
+        body = kwargs.get('body', None)
+        
+        logger.info("API Call: %s %s (Request ID: %s)", method_upper, url, request_id)
+        if logger.isEnabledFor(logging.DEBUG):
             if query:
-                logger.info(f"Query params: {query}")
+                logger.debug("Query params: %s", query)
             if body:
-                logger.info(f"Request body: {body}")
-                
-            try:
-                resp = requests.request(
-                    method.upper(), 
-                    url, 
-                    headers=headers, 
-                    params={k:v for k,v in query.items() if v is not None}, 
-                    json=body
-                )
-                logger.info(f"API Response: Status {resp.status_code} for {method.upper()} {url} (Request ID: {request_id})")
-                resp.raise_for_status()
-                return resp.json()
-            except requests.RequestException as e:
-                logger.error(f"API request failed: {str(e)}")
-                logger.error(traceback.format_exc())
-                raise
-
-        # attach standard metadata
-        _tool.__name__        = name
-        _tool.__doc__         = operation.get('description', '')
-        _tool._openapi_path   = path
-        _tool._openapi_method = method
-        _tool._parameters     = parameters
-        _tool._responses      = responses
-        _tool._tags           = operation.get('tags', [])
-
-        # now register
-        logger.info(f"Registering tool: {name} for {method.upper()} {path}")
-        mcp.tool()(_tool)
-        return name
-
-    logger.info(f"Starting to register tools with prefix: {TOOL_PREFIX}")
-    tool_count = 0
-    for path, methods in spec['paths'].items():
-        for method, operation in methods.items():
-            tool_name = _create_salable_tool(path, method, operation)
-            tool_count += 1
-    logger.info(f"Registered {tool_count} tools from the OpenAPI specification")
-
-except Exception as e:
-    logger.error(f"Initialization failed: {str(e)}")
-    logger.error(traceback.format_exc())
-    sys.exit(1)
+                logger.debug("Request body: %s", body)
+
+        # encode the body with orjson rather than httpx's stdlib json encoder
+        content = None
+        if body is not None:
+            content = orjson.dumps(body)
+            headers['Content-Type'] = 'application/json'
+
+        try:
+            resp = await client.request(
+                method_upper,
+                url,
+                headers=headers, 
+                params=query, 
+                content=content
+            )
+            logger.info("API Response: Status %s for %s %s (Request ID: %s)", resp.status_code, method_upper, url, request_id)
+            resp.raise_for_status()
+            if not resp.content:
+                return None
+            if 'json' in resp.headers.get('content-type', ''):
+                return orjson.loads(resp.content)
+            return resp.text
+        except httpx.HTTPError as e:
+            logger.exception("API request failed: %s", e)
+            raise
+
+    # attach standard metadata
+    _tool.__name__        = name
+    _tool.__doc__         = operation.get('description', '')
+    _tool._openapi_path   = path
+    _tool._openapi_method = method
+    _tool._parameters     = parameters
+    _tool._responses      = responses
+    _tool._tags           = operation.get('tags', [])
+
+    return _tool
+
+logger.info(f"Starting to register tools with prefix: {TOOL_PREFIX}")
+tool_count = 0
+for path, path_item in spec['paths'].items():
+    # path-level parameters apply to every operation unless the operation overrides them (same name and location)
+    path_parameters = path_item.get('parameters', [])
+    for method, operation in path_item.items():
+        # other path-item keys (parameters, summary, servers, ...) are not operations
+        if method not in HTTP_METHODS:
+            continue
+        if path_parameters:
+            overridden = {(p.get('name'), p.get('in')) for p in operation.get('parameters', [])}
+            operation = {
+                **operation,
+                'parameters': [p for p in path_parameters if (p.get('name'), p.get('in')) not in overridden]
+                              + operation.get('parameters', [])
+            }
+        tool_name = _tool_name(path, method)
+        if tool_name in _operations:
+            # same as FastMCP's ToolManager.add_tool: keep the first registration
+            logger.warning(f"Tool already exists: {tool_name} (skipping {method.upper()} {path})")
+            continue
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Registering tool: %s for %s %s", tool_name, method.upper(), path)
+        _operations[tool_name] = (path, method, operation)
+        tool_count += 1
+logger.info("Registered %d tools from the OpenAPI specification", tool_count)
 
 if __name__ == "__main__":
     if os.getenv("RUNNING_IN_PRODUCTION"):
-        # Production mode with multiple workers for better performance
-        logger.info(f"Starting server in production mode with {(multiprocessing.cpu_count() * 2) + 1} workers")
-        uvicorn.run(
-            "server:app",  # Pass as import string
-            host="0.0.0.0",
-            port=3000,
-            workers=(multiprocessing.cpu_count() * 2) + 1,
-            timeout_keep_alive=300,  # Increased for SSE connections
-            log_level="info"
-        )
+        # Production mode with one worker per core; async tools let each worker overlap many backend calls.
+        # Workers are forked by gunicorn from this process, so the spec download/parse and tool
+        # registration above run once per container and are shared copy-on-write.
+        from gunicorn.app.base import BaseApplication
+        from uvicorn_worker import UvicornWorker
+
+        class ProductionWorker(UvicornWorker):
+            # pinned so a slim image never silently falls back to asyncio/h11
+            CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+        class PreloadedApplication(BaseApplication):
+            def load_config(self):
+                self.cfg.set("bind", "0.0.0.0:3000")
+                self.cfg.set("workers", workers)
+                self.cfg.set("worker_class", ProductionWorker)
+                self.cfg.set("preload_app", True)
+                self.cfg.set("keepalive", 300)  # Increased for SSE connections
+                self.cfg.set("loglevel", "info")
+
+            def load(self):
+                return app
+
+        workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+        logger.info(f"Starting server in production mode with {workers} workers")
+        PreloadedApplication().run()
     else:
         # Development mode with a single worker for easier debugging
         logger.info("Starting server in development mode")